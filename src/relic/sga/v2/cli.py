@@ -15,19 +15,20 @@ from relic.sga.v2.serialization import essence_fs_serializer as v2_serializer
 
 _CHUNK_SIZE = 1024 * 1024 * 4  # 4 MiB
 
+_STORAGE_TYPE_ALIASES: Dict[str, StorageType] = {
+    "STORE": StorageType.STORE,
+    "BUFFER": StorageType.BUFFER_COMPRESS,
+    "STREAM": StorageType.STREAM_COMPRESS,
+}
+
 
 def _resolve_storage_type(s: Optional[str]) -> StorageType:
-    _HELPER = {
-        "STORE": StorageType.STORE,
-        "BUFFER": StorageType.BUFFER_COMPRESS,
-        "STREAM": StorageType.STREAM_COMPRESS,
-    }
     if s is None:
         return StorageType.STORE
 
     s = s.upper()
-    if s in _HELPER:
-        return _HELPER[s]
+    if s in _STORAGE_TYPE_ALIASES:
+        return _STORAGE_TYPE_ALIASES[s]
     else:
         return StorageType[s]
 
@@ -104,6 +105,13 @@ class RelicSgaPackV2Cli(CliPlugin):
             for solver in drive["solvers"]:
                 # Determine storage type
                 storage = _resolve_storage_type(solver.get("storage"))
+                # Dumb way of supporting query; compiled once per solver, not per file
+                query = solver.get("query")
+                compiled_query = (
+                    None
+                    if query is None or len(query) == 0
+                    else compile(query, "<query>", "eval")
+                )
                 # Find matching files
                 for path in _R.rglob(solver["match"]):
                     if not path.is_file():  # Edge case handling
@@ -113,22 +121,16 @@ class RelicSgaPackV2Cli(CliPlugin):
                     if full_path in frontier:
                         continue
                     path_in_sga = os.path.relpath(full_path, drive_cwd)
-                    size = os.stat(full_path).st_size
-
-                    # Dumb way of supporting query
-                    query = solver.get("query")
-                    if query is None or len(query) == 0:
-                        ...  # do nothing
-                    else:
-                        result = eval(query, {"size": size})
+
+                    if compiled_query is not None:
+                        size = os.stat(full_path).st_size  # only queries use the size
+                        result = eval(compiled_query, {"size": size})
                         if not result:
                             continue  # Query Failure
 
                     # match found, copy file to FS
                     # EssenceFS is unfortunately,
-                    print(
-                        f"\t\tPacking File `{os.path.relpath(full_path, drive_cwd)}` w/ `{storage.name}`"
-                    )
+                    print(f"\t\tPacking File `{path_in_sga}` w/ `{storage.name}`")
                     frontier.add(full_path)
                     if (
                         sga_drive is None
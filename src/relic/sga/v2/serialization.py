@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from typing import BinaryIO, Dict, Tuple, cast, Any
 
 from fs.base import FS
-from relic.core.errors import MismatchError
+from relic.core.errors import MismatchError, RelicToolError
 from relic.sga.core import serialization as _s
 from relic.sga.core.definitions import StorageType
 from relic.sga.core.filesystem import registry
@@ -191,14 +191,19 @@ def meta2def(meta: Dict[str, object]) -> FileDef:
     return FileDef(None, None, None, None, meta["storage_type"])  # type: ignore
 
 
+# The header stored before each file's data;
+#   256 byte name buffer (likely 256 cause 'max path' on windows used to be 256),
+#   4 byte timestamp, and 4 byte crc32
+_DATA_HEADER_NAME_SIZE = 256
+_data_header_layout = Struct(f"<{_DATA_HEADER_NAME_SIZE}s 4s I")
+
+
 class _AssemblerV2(FSAssembler[FileDef]):
     def assemble_file(self, parent_dir: FS, file_def: FileDef) -> None:
         super().assemble_file(parent_dir, file_def)
 
         # Still hate this, but might as well reuse it
-        _HEADER_SIZE = (
-            256 + 8
-        )  # 256 string buffer (likely 256 cause 'max path' on windows used to be 256), and 4 byte unk, and 4 byte checksum (crc32)
+        _HEADER_SIZE = _data_header_layout.size
         lazy_data_header = FileLazyInfo(
             jump_to=self.ptrs.data_pos + file_def.data_pos - _HEADER_SIZE,
             packed_size=_HEADER_SIZE,
@@ -254,16 +259,23 @@ class _AssemblerV2(FSAssembler[FileDef]):
                 if len(data_header) != _HEADER_SIZE:
                     _generate_metadata()
                 else:
-                    name = data_header[:256].rstrip(b"\0").decode("ascii")
+                    name_buffer: bytes
+                    modified_buffer: bytes
+                    crc32_value: int
+                    (
+                        name_buffer,
+                        modified_buffer,
+                        crc32_value,
+                    ) = _data_header_layout.unpack(data_header)
+                    name = name_buffer.rstrip(b"\0").decode("ascii")
                     expected_name = self.names[file_def.name_pos]
                     if name != expected_name:
                         _generate_metadata()  # assume invalid metadata block
                     else:
-                        modified_buffer: bytes = data_header[256:260]
                         modified = int.from_bytes(
                             modified_buffer, "little", signed=False
                         )
-                        crc32 = data_header[260:264]
+                        crc32 = crc32_value.to_bytes(4, "little", signed=False)
                         crc32_generated = _generate_crc32()
 
                         if crc32 != crc32_generated:
@@ -275,15 +287,21 @@ class _AssemblerV2(FSAssembler[FileDef]):
 
 
 class _DisassassemblerV2(FSDisassembler[FileDef]):
-    _HEADER_SIZE = (
-        256 + 8
-    )  # 256 string buffer (likely 256 cause 'max path' on windows used to be 256), and 8 byte checksum
-
     def disassemble_file(self, container_fs: FS, file_name: str) -> FileDef:
+        encoded_name = file_name.encode("ascii")
+        if len(encoded_name) > _DATA_HEADER_NAME_SIZE:
+            # struct would silently truncate the name, corrupting the stored metadata
+            raise RelicToolError(
+                f"File name `{file_name}` is {len(encoded_name)} bytes;"
+                f" SGA V2 file names are limited to {_DATA_HEADER_NAME_SIZE} bytes!"
+            )
+
         with container_fs.open(file_name, "rb") as handle:
             data = handle.read()
 
-        metadata = dict(container_fs.getinfo(file_name, ["essence"]).raw["essence"])
+        # Fetch both namespaces in one lookup; 'details' is needed for the timestamp below
+        info = container_fs.getinfo(file_name, ["essence", "details"])
+        metadata = dict(info.raw["essence"])
 
         file_def: FileDef = self.meta2def(metadata)
         _storage_type_value: int = metadata["storage_type"]  # type: ignore
@@ -308,9 +326,6 @@ class _DisassassemblerV2(FSDisassembler[FileDef]):
             file_name, self.name_stream, self.flat_names
         )
 
-        name_buffer = bytearray(b"\0" * 256)
-        name_buffer[0 : len(file_name)] = file_name.encode("ascii")
-        _name_buffer_pos = _write_data(name_buffer, self.data_stream)
         uncompressed_crc = zlib.crc32(data)
         # compressed_crc = zlib.crc32(store_data)
         if "modified" in metadata and metadata["modified"] != int.from_bytes(
@@ -321,7 +336,6 @@ class _DisassassemblerV2(FSDisassembler[FileDef]):
 
             # if creation/modification are different, use the new timestamp
             # Cumbersome, but allows header MD5s to invalidate
-            info = container_fs.getinfo(file_name, ["details"])
             modified = info.get("details", "modified", None)
             created = info.get("details", "created", None)
             if modified is not None and created is not None:
@@ -329,15 +343,16 @@ class _DisassassemblerV2(FSDisassembler[FileDef]):
                     timestamp_buffer = int(modified).to_bytes(4, "little", signed=False)
 
         else:
-            info = container_fs.getinfo(file_name, ["details"])
             timestamp: float = info.get("details", "modified", time.time())  # type: ignore
             timestamp_buffer = int(timestamp).to_bytes(4, "little", signed=False)
 
-        _unk_buffer_pos = _write_data(timestamp_buffer, self.data_stream)
-
-        _crc_buffer_pos = _write_data(
-            uncompressed_crc.to_bytes(4, "little", signed=False), self.data_stream
-        )  # should always recalc the crc, regardless of the cached value in metadata
+        # Name, timestamp & crc are packed in one call; the layout null-pads the name
+        data_header = _data_header_layout.pack(
+            encoded_name,
+            timestamp_buffer,
+            uncompressed_crc,  # should always recalc the crc, regardless of the cached value in metadata
+        )
+        _data_header_pos = _write_data(data_header, self.data_stream)
         file_def.data_pos = _write_data(store_data, self.data_stream)
 
         return file_def
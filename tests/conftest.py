@@ -1 +1,158 @@
-# Here exclusively to auto-modify pytest's python path
+# Auto-modifies pytest's python path, and discovers the V2 archives to test against
+import atexit
+import functools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Iterable, Iterator, Any, Dict, Set, Tuple
+
+import pytest
+from relic.sga.core import MagicWord, Version
+
+from relic.sga import v2
+
+_path = Path(__file__).parent
+_SOURCES_PATH = _path / "sources.json"
+_IMPLICIT_TEST_DATA = str(_path / "data")
+
+# Scan results are cached between runs, keyed by the file's (mtime, size)
+_SCAN_CACHE_PATH = _path / ".sga_scan_cache.json"
+_USE_SCAN_CACHE = os.environ.get("SGA_TEST_NOCACHE") != "1"
+_scan_cache: Dict[str, List[Any]] = {}
+_scan_cache_loaded = False
+_scan_cache_dirty = False
+
+
+def _load_scan_cache() -> None:
+    global _scan_cache, _scan_cache_loaded
+    if _scan_cache_loaded:
+        return
+    _scan_cache_loaded = True
+    if not _USE_SCAN_CACHE:
+        return
+    try:
+        with _SCAN_CACHE_PATH.open() as stream:
+            loaded = json.load(stream)
+    except (IOError, ValueError):
+        loaded = {}
+    # The cache is an optimization; a malformed file is treated as empty
+    _scan_cache = loaded if isinstance(loaded, dict) else {}
+    atexit.register(_save_scan_cache)
+
+
+def _save_scan_cache() -> None:
+    if not _scan_cache_dirty:
+        return
+    # Write to a temp file & swap it in; parallel workers (xdist) may save at the same time
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=_path, prefix=".sga_scan_cache.", suffix=".tmp", delete=False
+        ) as stream:
+            tmp_path = stream.name
+            json.dump(_scan_cache, stream)
+        os.replace(tmp_path, _SCAN_CACHE_PATH)
+    except IOError:
+        # cache is an optimization; failing to write it is not an error
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except IOError:
+                ...
+
+
+def _load_file_sources() -> Dict[str, List[str]]:
+    try:
+        with _SOURCES_PATH.open() as stream:
+            file_sources: Dict[str, List[str]] = json.load(stream)
+    except IOError:
+        file_sources = {}
+
+    if "dirs" not in file_sources:
+        file_sources["dirs"] = []
+
+    if _IMPLICIT_TEST_DATA not in file_sources["dirs"]:
+        file_sources["dirs"].append(_IMPLICIT_TEST_DATA)
+
+    return file_sources
+
+
+# The leading bytes of every V2 archive; the magic word followed by the version
+_V2_HEADER = MagicWord.word + Version.LAYOUT.pack(v2.version.major, v2.version.minor)
+
+
+def _is_v2_file(path: str) -> bool:
+    # Only the magic word & version are needed; read them with a single syscall
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        header = os.read(fd, len(_V2_HEADER))
+    finally:
+        os.close(fd)
+    return header == _V2_HEADER
+
+
+def _scan_files(root_dir: str, suffix: str) -> Iterator["os.DirEntry[str]"]:
+    # os.scandir reports entry types (and caches stat) itself; avoids a Path object & extra stat per entry
+    stack = [root_dir]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                # normcase matches the platform's glob; case-insensitive on Windows
+                elif os.path.normcase(entry.name).endswith(suffix) and entry.is_file():
+                    yield entry
+
+
+def v2_scan_directory(root_dir: str) -> Iterable[str]:
+    global _scan_cache_dirty
+    _load_scan_cache()
+    seen: Set[str] = set()
+    for entry in _scan_files(root_dir, ".sga"):
+        path = entry.path
+        seen.add(path)
+        stat = entry.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        cached = _scan_cache.get(path)
+        if isinstance(cached, list) and len(cached) == 3 and cached[:2] == key:
+            is_v2 = bool(cached[2])
+        else:
+            is_v2 = _is_v2_file(path)
+            _scan_cache[path] = [*key, is_v2]
+            _scan_cache_dirty = True
+        if is_v2:
+            # if os.path.exists(os.path.splitext(path)[0] + ".json"):  # ensure expected results file is also present
+            yield path
+
+    # Forget files under this root that have since been removed, so the cache doesn't grow forever
+    root_prefix = os.path.join(root_dir, "")
+    stale = [path for path in _scan_cache if path.startswith(root_prefix) and path not in seen]
+    for path in stale:
+        del _scan_cache[path]
+    if stale:
+        _scan_cache_dirty = True
+
+
+@functools.lru_cache(maxsize=None)
+def discover_v2_files() -> Tuple[str, ...]:
+    # Memoized; every module requesting `v2_file_path` shares a single scan
+    file_sources = _load_file_sources()
+    v2_test_files: List[str] = []
+
+    for dir in file_sources.get("dirs", []):
+        results = v2_scan_directory(dir)
+        v2_test_files.extend(results)
+    v2_test_files.extend(file_sources.get("files", []))
+
+    return tuple(dict.fromkeys(v2_test_files))  # Get unique paths, keeping order
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    # Discovery runs during collection rather than at import time
+    if "v2_file_path" in metafunc.fixturenames:
+        metafunc.parametrize("v2_file_path", discover_v2_files())
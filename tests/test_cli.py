@@ -1,16 +1,19 @@
 import io
+import json
 import os.path
 import subprocess
 
 # Local testing requires running `pip install -e "."`
 import tempfile
 from contextlib import redirect_stdout
-from typing import Sequence
+from typing import Sequence, List, Dict, Any
 
 import fs
 import pytest
 from fs.base import FS
+from fs.errors import ResourceNotFound
 from fs.info import Info
+from relic.sga.core import StorageType
 
 
 class CommandTests:
@@ -52,8 +55,11 @@ class TestRelicSgaCli(CommandTests):
     ...
 
 
+_DATA_DIR = os.path.abspath(os.path.join(__file__, "../data"))
+
+
 def _get_sample_file(path: str):
-    return os.path.abspath(os.path.join(__file__, "../data", path))
+    return os.path.join(_DATA_DIR, path)
 
 
 _SAMPLE_V2 = _get_sample_file("SampleSGA-v2.sga")
@@ -86,66 +92,92 @@ def test_cli_unpack_pack_one_to_one(src: str):
     from relic.core.cli import cli_root as cli
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        cli.run_with("sga", "unpack", src, temp_dir)
-        cfg_file_name = None
-        repacked_file_name = None
-        try:
-            with tempfile.NamedTemporaryFile("w+", delete=False) as config_file:
-                config_file.write(cfg)
-                cfg_file_name = config_file.name
-            with tempfile.NamedTemporaryFile("rb", delete=False) as repacked:
-                repacked_file_name = repacked.name
-
-            status = cli.run_with(
-                "sga", "pack", "v2", temp_dir, repacked_file_name, cfg_file_name
-            )
-            assert status == 0
-
-            def check_against(src: FS, dest: FS):
-                for root, _, files in src.walk():
-                    assert dest.exists(root)
-                    with dest.opendir(root) as root_folder:
-                        for file in files:
-                            file: Info
-                            assert root_folder.exists(file.name)
-
-                    for file in files:
-                        file: Info
-                        path = fs.path.join(root, file.name)
-                        with src.openbin(path) as src_file:
-                            with dest.openbin(path) as dest_file:
-                                src_data = src_file.read()
-                                dest_data = dest_file.read()
-                                assert dest_data == src_data
-
-            with fs.open_fs(f"sga://{src}") as src_sga:
-                with fs.open_fs(f"sga://{repacked_file_name}") as dst_sga:
-                    check_against(dst_sga, src_sga)
-
-        finally:
-            try:
-                os.unlink(cfg_file_name)
-            except:
-                ...
-            try:
-                os.unlink(repacked_file_name)
-            except:
-                ...
+        # All scratch files share one directory, so a single cleanup removes them
+        unpacked_dir = os.path.join(temp_dir, "unpacked")
+        cfg_file_name = os.path.join(temp_dir, "config.json")
+        repacked_file_name = os.path.join(temp_dir, "repacked.sga")
+        os.mkdir(unpacked_dir)
+
+        cli.run_with("sga", "unpack", src, unpacked_dir)
+        with open(cfg_file_name, "w") as config_file:
+            config_file.write(cfg)
+
+        status = cli.run_with(
+            "sga", "pack", "v2", unpacked_dir, repacked_file_name, cfg_file_name
+        )
+        assert status == 0
+
+        def check_against(src: FS, dest: FS):
+            for root, _, files in src.walk():
+                assert dest.exists(root)
+                for file in files:
+                    file: Info
+                    path = fs.path.join(root, file.name)
+                    # Sizes are known without reading the data; fail early on a mismatch
+                    # A missing file raises here, so no separate `exists` check is needed
+                    try:
+                        dest_size = dest.getsize(path)
+                    except ResourceNotFound:
+                        pytest.fail(f"'{path}' does not exist in the destination")
+                    assert dest_size == src.getsize(path)
+                    with src.openbin(path) as src_file:
+                        with dest.openbin(path) as dest_file:
+                            src_data = src_file.read()
+                            dest_data = dest_file.read()
+                            assert dest_data == src_data
+
+        with fs.open_fs(f"sga://{src}") as src_sga:
+            with fs.open_fs(f"sga://{repacked_file_name}") as dst_sga:
+                check_against(dst_sga, src_sga)
 
 
 @pytest.mark.parametrize("src", argvalues=_SAMPLES, ids=_SAMPLES)
 def test_cli_repack(src: str):
     from relic.core.cli import cli_root as cli
 
-    repacked_file_name = None
-    try:
-        with tempfile.NamedTemporaryFile("w+", delete=False) as config_file:
-            repacked_file_name = config_file.name
-
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repacked_file_name = os.path.join(temp_dir, "repacked.sga")
         status = cli.run_with("sga", "repack", "v2", src, repacked_file_name)
         assert status == 0
-    finally:
-        try:
-            os.unlink(repacked_file_name)
-        except:
-            ...
+
+
+def _pack_with_solvers(temp_dir: str, solvers: List[Dict[str, Any]]) -> str:
+    src_dir = os.path.join(temp_dir, "src")
+    os.mkdir(src_dir)
+    with open(os.path.join(src_dir, "small.txt"), "wb") as small:
+        small.write(b"a" * 10)
+    with open(os.path.join(src_dir, "large.txt"), "wb") as large:
+        large.write(b"b" * 1000)
+
+    cfg_file_name = os.path.join(temp_dir, "config.json")
+    with open(cfg_file_name, "w") as config_file:
+        json.dump({"test": {"name": "Query Data", "solvers": solvers}}, config_file)
+
+    from relic.core.cli import cli_root as cli
+
+    packed_file_name = os.path.join(temp_dir, "packed.sga")
+    status = cli.run_with("sga", "pack", "v2", src_dir, packed_file_name, cfg_file_name)
+    assert status == 0
+    return packed_file_name
+
+
+def test_cli_pack_query():
+    solvers = [
+        {"match": "*.txt", "storage": "store", "query": "size > 100"},
+        {"match": "*.txt", "storage": "buffer", "query": ""},  # empty; matches all
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        packed_file_name = _pack_with_solvers(temp_dir, solvers)
+        with fs.open_fs(f"sga://{packed_file_name}") as sga:
+            large = sga.getinfo("test:/large.txt", ["essence"])
+            small = sga.getinfo("test:/small.txt", ["essence"])
+            assert large.get("essence", "storage_type") == StorageType.STORE
+            assert small.get("essence", "storage_type") == StorageType.BUFFER_COMPRESS
+
+
+def test_cli_pack_invalid_query():
+    # Queries are compiled when the solver starts; even if no file would match
+    solvers = [{"match": "*.missing", "storage": "store", "query": "size >"}]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(SyntaxError):
+            _pack_with_solvers(temp_dir, solvers)
@@ -0,0 +1,55 @@
+import zlib
+from io import BytesIO
+
+import pytest
+from relic.core.errors import RelicToolError
+from relic.sga.core import StorageType
+from relic.sga.core.filesystem import EssenceFS
+
+from relic.sga.v2.serialization import essence_fs_serializer
+
+_DATA = b"data"
+_MODIFIED = 1697739416
+
+
+def _create_sga(file_name: str) -> EssenceFS:
+    sga = EssenceFS()
+    sga.setmeta(
+        {"name": "Name Test", "header_md5": "0" * 16, "file_md5": "0" * 16},
+        "essence",
+    )
+    drive = sga.create_drive("test", "Name Test")
+    drive.writebytes(file_name, _DATA)
+    drive.setinfo(
+        file_name,
+        {
+            "essence": {"storage_type": StorageType.STORE, "modified": _MODIFIED},
+            "details": {"modified": _MODIFIED},
+        },
+    )
+    return sga
+
+
+def test_write_name_fits_data_header():
+    # A 256 byte name fills the data header's name field, leaving no null terminator
+    file_name = "a" * 256
+    with BytesIO() as stream:
+        essence_fs_serializer.write(stream, _create_sga(file_name))
+        stream.seek(0)
+        sga = essence_fs_serializer.read(stream)
+
+    path = f"test:/{file_name}"
+    assert sga.exists(path)
+    info = sga.getinfo(path, ["essence"])
+    assert info.get("essence", "name") == file_name
+    # Read from the data header; not regenerated metadata
+    assert info.get("essence", "modified") == _MODIFIED
+    assert info.get("essence", "crc32") == zlib.crc32(_DATA).to_bytes(
+        4, "little", signed=False
+    )
+
+
+def test_write_name_too_long():
+    with BytesIO() as stream:
+        with pytest.raises(RelicToolError):
+            essence_fs_serializer.write(stream, _create_sga("a" * 257))